@@ -136,6 +136,11 @@ class AgentLoop:
                     workspace=self.workspace,
                     max_chars=self.browse_config.max_chars,
                     screenshot_dir=self.browse_config.screenshot_dir,
+                    pool_size=self.browse_config.pool_size,
+                    block_images=self.browse_config.block_images,
+                    block_fonts=self.browse_config.block_fonts,
+                    block_media=self.browse_config.block_media,
+                    persist_profile=self.browse_config.persist_profile,
                 )
                 self.tools.register(self._browse_tool)
             except ImportError:
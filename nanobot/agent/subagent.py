@@ -121,6 +121,13 @@ class SubagentManager:
                         workspace=self.workspace,
                         max_chars=self.browse_config.max_chars,
                         screenshot_dir=self.browse_config.screenshot_dir,
+                        pool_size=self.browse_config.pool_size,
+                        block_images=self.browse_config.block_images,
+                        block_fonts=self.browse_config.block_fonts,
+                        block_media=self.browse_config.block_media,
+                        # Ephemeral profile: the main agent's browser may hold
+                        # the persistent profile's lock while a subagent runs.
+                        persist_profile=False,
                     )
                     tools.register(browse_tool)
                 except ImportError:
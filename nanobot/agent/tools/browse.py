@@ -1,6 +1,9 @@
 """Headless browser tool using Camoufox for JS-rendered pages."""
 
+import asyncio
+import hashlib
 import json
+import time
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +12,114 @@ from loguru import logger
 from nanobot.agent.tools.base import Tool
 from nanobot.agent.tools.web import _validate_url, _strip_tags, _normalize
 
+try:
+    import orjson
+except ImportError:  # optional Rust JSON encoder (browse extra)
+    orjson = None
+
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:  # optional C-accelerated parser (browse extra)
+    _SelectolaxParser = None
+
+
+def _dumps(obj: Any) -> str:
+    """Encode a tool response, via orjson when installed (responses carry up to max_chars of text).
+
+    Tool.execute results are embedded as str in provider message payloads,
+    so the orjson path's single UTF-8 decode is the only transcoding pass
+    between the page and the model; returning bytes here would just move
+    that decode into the agent loop.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, ensure_ascii=False, default=str)
+
+
+# Readability re-parses the whole DOM on every call; cache a few recent results
+# so repeated get_content on the same page skips the parse + scoring pass.
+_DOC_CACHE_SIZE = 8
+
+# Recycle pages after this many navigations to bound leaked page state.
+_MAX_USES_PER_PAGE = 50
+
+# Markup overhead bound: raw HTML chars fetched per char of extracted output.
+_HTML_SLICE_FACTOR = 8
+
+# JPEG quality for screenshots; text stays legible at a fraction of PNG size.
+_JPEG_QUALITY = 80
+
+# Reset the on-disk browser profile once it grows past this size.
+_MAX_PROFILE_BYTES = 256 * 1024 * 1024
+
+# Serve a repeated navigate to the same URL from cache for this long.
+_NAV_CACHE_TTL = 30.0
+_NAV_CACHE_SIZE = 32
+
+# Truncate execute_js results above this many JSON chars before they leave
+# the browser, so a script returning a huge DOM can't balloon Python memory.
+_JS_RESULT_CAP = 1_000_000
+
+# In-page extraction: ships only the article subtree across the CDP boundary
+# instead of the full serialized DOM. Returns null when the page has no
+# semantic landmark, in which case Python-side readability takes over.
+_EXTRACT_JS = """() => {
+  const root = document.querySelector("article, main, [role=main]");
+  if (!root) return null;
+  const clone = root.cloneNode(true);
+  clone.querySelectorAll("script, style, noscript, iframe").forEach(el => el.remove());
+  return {
+    title: document.title || "",
+    text: clone.innerText || clone.textContent || "",
+    html: clone.innerHTML || "",
+  };
+}"""
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Blocking buffered write, meant to run in a worker thread."""
+    with path.open("wb", buffering=1 << 20) as f:
+        f.write(data)
+
+
+def _html_to_text(html_str: str) -> str:
+    """Strip tags and normalize whitespace, via selectolax's C parser when installed."""
+    if _SelectolaxParser is not None:
+        tree = _SelectolaxParser(html_str)
+        tree.strip_tags(["script", "style"])
+        return _normalize(tree.text(separator="\n", strip=True))
+    return _normalize(_strip_tags(html_str))
+
+
+_HEADING_LEVELS = {f"h{i}": i for i in range(1, 7)}
+_BLOCK_TAGS = {"p", "div", "section", "article"}
+
+
+def _render_markdown(el) -> str:
+    """Render one lxml element (and its subtree) as a markdown fragment."""
+    tag = el.tag if isinstance(el.tag, str) else None  # comments/PIs have non-str tags
+    if tag is None or tag in ("script", "style"):
+        return ""  # comment/PI text is not content; the parent loop keeps el.tail
+    if tag in ("br", "hr"):
+        return "\n"
+
+    inner = el.text or ""
+    for child in el:
+        inner += _render_markdown(child)
+        if child.tail:
+            inner += child.tail
+
+    if tag == "a":
+        href = el.get("href")
+        return f"[{inner.strip()}]({href})" if href else inner
+    if tag in _HEADING_LEVELS:
+        return f"\n{'#' * _HEADING_LEVELS[tag]} {inner.strip()}\n"
+    if tag == "li":
+        return f"\n- {inner.strip()}"
+    if tag in _BLOCK_TAGS:
+        return inner + "\n\n"
+    return inner
+
 
 class WebBrowseTool(Tool):
     """Browse web pages with a headless Camoufox browser (JS-capable)."""
@@ -40,18 +151,25 @@ class WebBrowseTool(Tool):
             "waitUntil": {
                 "type": "string",
                 "enum": ["load", "domcontentloaded", "networkidle", "commit"],
-                "description": "When to consider navigation done (default: load)",
+                "description": "When to consider navigation done (default: domcontentloaded)",
+            },
+            "waitFor": {
+                "type": "string",
+                "description": "CSS selector to wait for after navigation (navigate action)",
             },
             "timeout": {
                 "type": "integer",
-                "description": "Navigation timeout in milliseconds (default: 30000)",
+                "description": "Navigation timeout in milliseconds (default: 10000)",
                 "minimum": 1000,
                 "maximum": 120000,
             },
             "extractMode": {
                 "type": "string",
-                "enum": ["text", "markdown"],
-                "description": "Content extraction mode (default: text)",
+                "enum": ["text", "markdown", "raw_text", "raw_html"],
+                "description": (
+                    "Content extraction mode (default: text). raw_text/raw_html "
+                    "skip article extraction and return the page as-is"
+                ),
             },
             "maxChars": {
                 "type": "integer",
@@ -62,6 +180,11 @@ class WebBrowseTool(Tool):
                 "type": "string",
                 "description": "Screenshot filename (default: auto-generated)",
             },
+            "format": {
+                "type": "string",
+                "enum": ["jpeg", "png"],
+                "description": "Screenshot encoding (default: jpeg at quality 80)",
+            },
             "script": {
                 "type": "string",
                 "description": "JavaScript expression to evaluate (execute_js action)",
@@ -75,23 +198,124 @@ class WebBrowseTool(Tool):
         workspace: Path,
         max_chars: int = 50000,
         screenshot_dir: str = "screenshots",
+        pool_size: int = 1,
+        block_images: bool = True,
+        block_fonts: bool = True,
+        block_media: bool = True,
+        persist_profile: bool = True,
     ):
         self.workspace = workspace
         self.max_chars = max_chars
         self.screenshot_dir = screenshot_dir
+        self.pool_size = max(pool_size, 1)
+        self.persist_profile = persist_profile
+        self._blocked_types = {
+            rtype
+            for rtype, blocked in (
+                ("image", block_images),
+                ("font", block_fonts),
+                ("media", block_media),
+            )
+            if blocked
+        }
         self._camoufox = None
+        self._browser = None
         self._page = None
+        self._page_pool: asyncio.Queue = asyncio.Queue()
+        self._page_uses: dict[int, int] = {}
+        self._cdp_sessions: dict[int, Any] = {}  # id(page) -> session, or None if unavailable
+        self._doc_cache: dict[bytes, tuple[str, str]] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._nav_cache: dict[str, tuple[float, str, str]] = {}
+        self._dispatch = {
+            "navigate": self._navigate,
+            "get_content": self._get_content,
+            "screenshot": self._screenshot,
+            "execute_js": self._execute_js,
+            "close": self._close_action,
+        }
 
     async def _ensure_browser(self) -> None:
-        """Lazily launch Camoufox on first use."""
-        if self._page is not None:
+        """Lazily launch Camoufox on first use and pre-warm the page pool."""
+        if self._browser is not None:
             return
 
         from camoufox.async_api import AsyncCamoufox
-        self._camoufox = AsyncCamoufox(headless=True)
-        browser = await self._camoufox.__aenter__()
-        self._page = await browser.new_page()
-        logger.debug("WebBrowseTool: Camoufox launched")
+        launch_kwargs: dict[str, Any] = {"headless": True}
+        if self.persist_profile:
+            # Keep profile init, caches, and cookies across restarts.
+            profile_dir = self.workspace / ".camoufox_profile"
+            self._prune_profile(profile_dir)
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            launch_kwargs.update(persistent_context=True, user_data_dir=str(profile_dir))
+        self._camoufox = AsyncCamoufox(**launch_kwargs)
+        self._browser = await self._camoufox.__aenter__()
+        for _ in range(self.pool_size):
+            self._page_pool.put_nowait(await self._new_page())
+        logger.debug("WebBrowseTool: Camoufox launched ({} pages)", self.pool_size)
+
+    @staticmethod
+    def _prune_profile(profile_dir: Path) -> None:
+        """Delete the persisted profile if it has grown past the size cap."""
+        if not profile_dir.is_dir():
+            return
+        try:
+            size = sum(f.stat().st_size for f in profile_dir.rglob("*") if f.is_file())
+        except OSError:
+            return
+        if size > _MAX_PROFILE_BYTES:
+            import shutil
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            logger.debug("WebBrowseTool: pruned oversized browser profile ({} bytes)", size)
+
+    async def _new_page(self):
+        """Create a page, blocking non-essential resource types if configured."""
+        page = await self._browser.new_page()
+        if self._blocked_types:
+            await page.route("**/*", self._route_handler)
+        return page
+
+    async def _route_handler(self, route) -> None:
+        if route.request.resource_type in self._blocked_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _acquire_page(self):
+        """Take a pooled page, falling back to the current one when none is idle.
+
+        On a cold pool every page may be mid-navigation and no current page
+        exists yet; poll until one lands in the pool or becomes current.
+        """
+        while True:
+            try:
+                return self._page_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            if self._page is not None:
+                return self._page
+            await asyncio.sleep(0.05)
+
+    async def _recycle_page(self, page):
+        """Close a page that hit the use cap and return a fresh replacement."""
+        self._page_uses.pop(id(page), None)
+        self._cdp_sessions.pop(id(page), None)
+        try:
+            await page.close()
+        except Exception:
+            pass
+        return await self._new_page()
+
+    async def _release_page(self, page) -> None:
+        """Return a page to the pool, recycling it after too many navigations."""
+        if self._page_uses.get(id(page), 0) >= _MAX_USES_PER_PAGE and self._browser is not None:
+            try:
+                page = await self._recycle_page(page)
+            except Exception:
+                # Re-pooling the closed page would poison the slot; a smaller
+                # pool beats a dead page in it.
+                return
+        self._page_pool.put_nowait(page)
 
     async def close(self) -> None:
         """Shut down the Camoufox browser."""
@@ -101,46 +325,118 @@ class WebBrowseTool(Tool):
             except Exception:
                 pass
             self._camoufox = None
+        self._browser = None
         self._page = None
+        self._page_pool = asyncio.Queue()
+        self._page_uses = {}
+        self._cdp_sessions = {}
         logger.debug("WebBrowseTool: browser closed")
 
     async def execute(self, action: str, **kwargs: Any) -> str:
+        handler = self._dispatch.get(action)
+        if handler is None:
+            return _dumps({"error": f"Unknown action: {action}"})
         try:
-            if action == "navigate":
-                return await self._navigate(**kwargs)
-            elif action == "get_content":
-                return await self._get_content(**kwargs)
-            elif action == "screenshot":
-                return await self._screenshot(**kwargs)
-            elif action == "execute_js":
-                return await self._execute_js(**kwargs)
-            elif action == "close":
-                await self.close()
-                return json.dumps({"ok": True, "message": "Browser closed"})
-            else:
-                return json.dumps({"error": f"Unknown action: {action}"})
+            return await handler(**kwargs)
         except Exception as e:
-            return json.dumps({"error": str(e)})
+            return _dumps({"error": str(e)})
+
+    async def _close_action(self, **_: Any) -> str:
+        await self.close()
+        return _dumps({"ok": True, "message": "Browser closed"})
 
     async def _navigate(
         self,
         url: str | None = None,
-        waitUntil: str = "load",
-        timeout: int = 30000,
+        waitUntil: str = "domcontentloaded",
+        timeout: int = 10000,
+        waitFor: str | None = None,
         **_: Any,
     ) -> str:
         if not url:
-            return json.dumps({"error": "url is required for navigate action"})
+            return _dumps({"error": "url is required for navigate action"})
 
         is_valid, error_msg = _validate_url(url)
         if not is_valid:
-            return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url})
+            return _dumps({"error": f"URL validation failed: {error_msg}", "url": url})
+
+        # Coalesce concurrent navigations to the same URL onto one goto.
+        inflight = self._inflight.get(url)
+        if inflight is not None:
+            return await inflight
 
+        cached = self._nav_cache.get(url)
+        if cached is not None:
+            expires, final_url, payload = cached
+            if (
+                time.monotonic() < expires
+                and self._page is not None
+                and self._page.url == final_url
+            ):
+                return payload
+            self._nav_cache.pop(url, None)
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = fut
+        try:
+            result = await self._do_navigate(url, waitUntil, timeout, waitFor)
+        except Exception as e:
+            # Hand waiters the same error JSON execute() would produce.
+            fut.set_result(_dumps({"error": str(e)}))
+            raise
+        else:
+            fut.set_result(result)
+            now = time.monotonic()
+            for stale in [u for u, entry in self._nav_cache.items() if entry[0] <= now]:
+                del self._nav_cache[stale]
+            if len(self._nav_cache) >= _NAV_CACHE_SIZE:
+                self._nav_cache.pop(next(iter(self._nav_cache)))
+            self._nav_cache[url] = (now + _NAV_CACHE_TTL, self._page.url, result)
+            return result
+        finally:
+            if not fut.done():
+                # A cancelled leader skips the except branch (CancelledError
+                # is a BaseException); waiters must still wake.
+                fut.set_result(_dumps({"error": f"Navigation to {url} was cancelled"}))
+            self._inflight.pop(url, None)
+
+    async def _do_navigate(
+        self,
+        url: str,
+        waitUntil: str,
+        timeout: int,
+        waitFor: str | None,
+    ) -> str:
         await self._ensure_browser()
-        response = await self._page.goto(url, wait_until=waitUntil, timeout=timeout)
+        page = await self._acquire_page()
+        if page is self._page and self._page_uses.get(id(page), 0) >= _MAX_USES_PER_PAGE:
+            # At pool_size=1 the current page is reused directly and never
+            # passes through _release_page, so enforce the use cap here.
+            self._page = None
+            page = await self._recycle_page(page)
+        try:
+            try:
+                response = await page.goto(url, wait_until=waitUntil, timeout=timeout)
+            except Exception as e:
+                # Late analytics/trackers often hold up the load event long
+                # after the DOM is usable; settle for first byte on retry.
+                if type(e).__name__ != "TimeoutError":
+                    raise
+                response = await page.goto(url, wait_until="commit", timeout=timeout)
+            if waitFor:
+                await page.wait_for_selector(waitFor, timeout=timeout)
+        except Exception:
+            if page is not self._page:
+                await self._release_page(page)
+            raise
+
+        self._page_uses[id(page)] = self._page_uses.get(id(page), 0) + 1
+        if self._page is not None and page is not self._page:
+            await self._release_page(self._page)
+        self._page = page
 
         status = response.status if response else None
-        return json.dumps({
+        return _dumps({
             "ok": True,
             "url": url,
             "finalUrl": self._page.url,
@@ -155,59 +451,234 @@ class WebBrowseTool(Tool):
         **_: Any,
     ) -> str:
         if self._page is None:
-            return json.dumps({"error": "No page loaded. Use navigate first."})
+            return _dumps({"error": "No page loaded. Use navigate first."})
 
         max_chars = maxChars or self.max_chars
-        title = await self._page.title()
         page_url = self._page.url
-        html_content = await self._page.content()
 
-        from readability import Document
+        if extractMode in ("raw_text", "raw_html"):
+            # Browser-native extraction: no readability scoring, no Python-side
+            # HTML parse, and the result is already bounded for raw_html. The
+            # slice fetches one char past the budget so truncation is detectable.
+            expr = (
+                "() => document.body.innerText"
+                if extractMode == "raw_text"
+                else f"() => document.documentElement.outerHTML.slice(0, {max_chars + 1})"
+            )
+            raw = await self._evaluate(expr)
+            text = raw if isinstance(raw, str) else ""
+            title = await self._page.title()
+            truncated = len(text) > max_chars
+            if truncated:
+                text = text[:max_chars]
+            return _dumps({
+                "url": page_url,
+                "title": title,
+                "extractor": "raw",
+                "truncated": truncated,
+                "length": len(text),
+                "text": text,
+            })
 
-        doc = Document(html_content)
-        if extractMode == "markdown":
-            text = self._to_markdown(doc.summary())
-        else:
-            text = _normalize(_strip_tags(doc.summary()))
+        try:
+            article = await self._evaluate(_EXTRACT_JS)
+        except Exception:
+            article = None
 
-        if doc.title():
-            text = f"# {doc.title()}\n\n{text}"
+        fetch_clipped = False
+        if isinstance(article, dict) and (article.get("text") or "").strip():
+            title = article_title = article.get("title") or await self._page.title()
+            extractor = "in-page"
+            if extractMode == "markdown":
+                text = self._to_markdown(article.get("html") or "")
+            else:
+                text = _normalize(article["text"])
+        else:
+            title, (html_content, fetch_clipped) = await asyncio.gather(
+                self._page.title(), self._page_html(max_chars)
+            )
+            summary_html, article_title = self._parse_article(html_content)
+            extractor = "readability"
+            if extractMode == "markdown":
+                text = self._to_markdown(summary_html)
+            else:
+                text = _html_to_text(summary_html)
 
-        truncated = len(text) > max_chars
-        if truncated:
-            text = text[:max_chars]
+        # Truncate before prefixing the title so the full-size buffer is
+        # sliced once instead of concatenated and then copied again.
+        prefix = f"# {article_title}\n\n" if article_title else ""
+        budget = max_chars - len(prefix)
+        if budget <= 0:
+            truncated = True
+            text = prefix[:max_chars]
+        else:
+            # A clipped HTML fetch means unextracted tail content, even when
+            # the extracted text fits the budget.
+            truncated = len(text) > budget or fetch_clipped
+            if len(text) > budget:
+                text = text[:budget]
+            text = prefix + text
 
-        return json.dumps({
+        return _dumps({
             "url": page_url,
             "title": title,
-            "extractor": "readability",
+            "extractor": extractor,
             "truncated": truncated,
             "length": len(text),
             "text": text,
-        }, ensure_ascii=False)
+        })
+
+    async def _get_cdp(self, page):
+        """Return the page's persistent CDP session, probing availability once.
+
+        CDP sessions exist on Chromium only, so under Camoufox (Firefox) the
+        probe fails and None is cached; later calls cost a dict lookup.
+        """
+        key = id(page)
+        if key in self._cdp_sessions:
+            return self._cdp_sessions[key]
+        try:
+            session = await page.context.new_cdp_session(page)
+        except Exception:
+            session = None
+        self._cdp_sessions[key] = session
+        return session
+
+    async def _evaluate(self, fn_src: str) -> Any:
+        """Evaluate a JS function source on the current page.
+
+        Prefers one Runtime.evaluate frame on the page's persistent CDP
+        session over the high-level API's per-call protocol dance; falls back
+        to page.evaluate where CDP is unavailable.
+        """
+        cdp = await self._get_cdp(self._page)
+        if cdp is not None:
+            try:
+                res = await cdp.send("Runtime.evaluate", {
+                    "expression": f"({fn_src})()",
+                    "returnByValue": True,
+                    "awaitPromise": True,
+                })
+                if isinstance(res, dict) and "exceptionDetails" not in res:
+                    return res.get("result", {}).get("value")
+            except Exception:
+                self._cdp_sessions[id(self._page)] = None
+        return await self._page.evaluate(fn_src)
+
+    async def _cdp_article_html(self) -> str | None:
+        """Fetch only the article subtree over the page's CDP session.
+
+        Returns None where CDP is unavailable (Camoufox/Firefox); it covers
+        Chromium deployments and pages whose CSP blocks script evaluation but
+        not DOM inspection.
+        """
+        cdp = await self._get_cdp(self._page)
+        if cdp is None:
+            return None
+        try:
+            root = await cdp.send("DOM.getDocument", {"depth": 1})
+            if not isinstance(root, dict):
+                return None
+            node = await cdp.send("DOM.querySelector", {
+                "nodeId": root["root"]["nodeId"],
+                "selector": "article, main, [role=main]",
+            })
+            if not isinstance(node, dict) or not node.get("nodeId"):
+                return None
+            outer = await cdp.send("DOM.getOuterHTML", {"nodeId": node["nodeId"]})
+            html = outer.get("outerHTML") if isinstance(outer, dict) else None
+            return html if isinstance(html, str) and html else None
+        except Exception:
+            return None
+
+    async def _page_html(self, max_chars: int) -> tuple[str, bool]:
+        """Fetch page HTML sliced in-browser so transfer and allocation stay O(max_chars).
+
+        Returns (html, clipped); clipped means the slice hit its limit and
+        the document tail was never fetched.
+        """
+        article_html = await self._cdp_article_html()
+        if article_html:
+            return article_html, False
+        limit = max_chars * _HTML_SLICE_FACTOR
+        try:
+            # One char past the limit so hitting it is distinguishable from
+            # a document that is exactly limit chars long.
+            raw = await self._evaluate(
+                f"() => document.documentElement.outerHTML.slice(0, {limit + 1})"
+            )
+        except Exception:
+            raw = None
+        if isinstance(raw, str) and raw:
+            return raw[:limit], len(raw) > limit
+        return await self._page.content(), False
+
+    def _parse_article(self, html_content: str) -> tuple[str, str]:
+        """Run readability once per unique HTML, caching (summary_html, title).
+
+        Both extract modes (text and markdown) dispatch off the same cached
+        summary, so switching modes on one page never re-runs the scoring pass.
+        """
+        key = hashlib.blake2b(html_content.encode("utf-8", "replace"), digest_size=16).digest()
+        cached = self._doc_cache.get(key)
+        if cached is not None:
+            return cached
+
+        from readability import Document
+
+        doc = Document(html_content)
+        parsed = (doc.summary(), doc.title())
+        if len(self._doc_cache) >= _DOC_CACHE_SIZE:
+            self._doc_cache.pop(next(iter(self._doc_cache)))
+        self._doc_cache[key] = parsed
+        return parsed
 
     async def _screenshot(
         self,
         filename: str | None = None,
+        format: str = "jpeg",
         **_: Any,
     ) -> str:
         if self._page is None:
-            return json.dumps({"error": "No page loaded. Use navigate first."})
-
-        import time
+            return _dumps({"error": "No page loaded. Use navigate first."})
 
         screenshot_dir = self.workspace / self.screenshot_dir
         screenshot_dir.mkdir(parents=True, exist_ok=True)
 
+        if filename and filename.endswith(".png"):
+            format = "png"  # explicit extension wins over the default encoding
+        ext = ".png" if format == "png" else ".jpg"
         if not filename:
-            filename = f"screenshot_{int(time.time())}.png"
-        if not filename.endswith(".png"):
-            filename += ".png"
+            filename = f"screenshot_{int(time.time())}{ext}"
+        if not filename.endswith((".png", ".jpg", ".jpeg")):
+            filename += ext
+
+        shot_kwargs: dict[str, Any] = {"full_page": True, "type": format}
+        if format == "jpeg":
+            shot_kwargs["quality"] = _JPEG_QUALITY
 
         path = screenshot_dir / filename
-        await self._page.screenshot(path=str(path), full_page=True)
+        if self._blocked_types:
+            # Lift blocking while capturing so lazy-loaded assets triggered by
+            # the full-page scroll come through (already-aborted fetches are
+            # not retried, so heavy pages may still show gaps).
+            try:
+                await self._page.unroute("**/*", self._route_handler)
+            except Exception:
+                pass
+        try:
+            data = await self._page.screenshot(**shot_kwargs)
+        finally:
+            if self._blocked_types:
+                try:
+                    await self._page.route("**/*", self._route_handler)
+                except Exception:
+                    pass
+
+        # Write off the loop so a multi-MB capture doesn't stall other tools.
+        await asyncio.to_thread(_write_bytes, path, data)
 
-        return json.dumps({
+        return _dumps({
             "ok": True,
             "path": str(path),
             "url": self._page.url,
@@ -219,28 +690,33 @@ class WebBrowseTool(Tool):
         **_: Any,
     ) -> str:
         if not script:
-            return json.dumps({"error": "script is required for execute_js action"})
+            return _dumps({"error": "script is required for execute_js action"})
         if self._page is None:
-            return json.dumps({"error": "No page loaded. Use navigate first."})
+            return _dumps({"error": "No page loaded. Use navigate first."})
 
-        result = await self._page.evaluate(script)
-        return json.dumps({"ok": True, "result": result}, ensure_ascii=False, default=str)
+        # Probe the serialized size in-browser; function-valued scripts are
+        # invoked so both expressions and arrow functions keep working.
+        wrapped = f"""() => {{
+  const __r = ({script});
+  const __v = (typeof __r === "function") ? __r() : __r;
+  const __s = JSON.stringify(__v);
+  if (__s !== undefined && __s.length > {_JS_RESULT_CAP}) {{
+    return {{__truncated: true, preview: __s.slice(0, {_JS_RESULT_CAP})}};
+  }}
+  return __v;
+}}"""
+        result = await self._evaluate(wrapped)
+        if isinstance(result, dict) and result.get("__truncated"):
+            return _dumps({"ok": True, "truncated": True, "result": result.get("preview", "")})
+        return _dumps({"ok": True, "result": result})
 
     @staticmethod
     def _to_markdown(html_str: str) -> str:
-        """Convert HTML to markdown (same approach as WebFetchTool)."""
-        import re
-        text = re.sub(
-            r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-            lambda m: f'[{_strip_tags(m[2])}]({m[1]})',
-            html_str, flags=re.I,
-        )
-        text = re.sub(
-            r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-            lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n',
-            text, flags=re.I,
-        )
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
-        return _normalize(_strip_tags(text))
+        """Convert HTML to markdown with a single lxml parse + tree walk."""
+        import lxml.html
+
+        try:
+            tree = lxml.html.fragment_fromstring(html_str, create_parent=True)
+        except Exception:
+            return _normalize(_strip_tags(html_str))
+        return _normalize(_render_markdown(tree))
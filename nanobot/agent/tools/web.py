@@ -1,5 +1,6 @@
 """Web tools: web_search and web_fetch."""
 
+import functools
 import html
 import json
 import os
@@ -16,23 +17,36 @@ from nanobot.agent.tools.base import Tool
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
 MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
 
+# Precompiled patterns for the extraction hot path (web_fetch and web_browse)
+_RE_SCRIPT = re.compile(r'<script[\s\S]*?</script>', re.I)
+_RE_STYLE = re.compile(r'<style[\s\S]*?</style>', re.I)
+_RE_TAG = re.compile(r'<[^>]+>')
+_RE_SPACES = re.compile(r'[ \t]+')
+_RE_BLANK_LINES = re.compile(r'\n{3,}')
+_RE_A = re.compile(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>', re.I)
+_RE_H = re.compile(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>', re.I)
+_RE_LI = re.compile(r'<li[^>]*>([\s\S]*?)</li>', re.I)
+_RE_BLOCK = re.compile(r'</(p|div|section|article)>', re.I)
+_RE_BR = re.compile(r'<(br|hr)\s*/?>', re.I)
+
 
 def _strip_tags(text: str) -> str:
     """Remove HTML tags and decode entities."""
-    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
-    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _RE_SCRIPT.sub('', text)
+    text = _RE_STYLE.sub('', text)
+    text = _RE_TAG.sub('', text)
     return html.unescape(text).strip()
 
 
 def _normalize(text: str) -> str:
     """Normalize whitespace."""
-    text = re.sub(r'[ \t]+', ' ', text)
-    return re.sub(r'\n{3,}', '\n\n', text).strip()
+    text = _RE_SPACES.sub(' ', text)
+    return _RE_BLANK_LINES.sub('\n\n', text).strip()
 
 
+@functools.lru_cache(maxsize=1024)
 def _validate_url(url: str) -> tuple[bool, str]:
-    """Validate URL: must be http(s) with valid domain."""
+    """Validate URL: must be http(s) with valid domain. Memoized for repeat URLs."""
     try:
         p = urlparse(url)
         if p.scheme not in ('http', 'https'):
@@ -171,11 +185,9 @@ class WebFetchTool(Tool):
     def _to_markdown(self, html: str) -> str:
         """Convert HTML to markdown."""
         # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
+        text = _RE_A.sub(lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html)
+        text = _RE_H.sub(lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text)
+        text = _RE_LI.sub(lambda m: f'\n- {_strip_tags(m[1])}', text)
+        text = _RE_BLOCK.sub('\n\n', text)
+        text = _RE_BR.sub('\n', text)
         return _normalize(_strip_tags(text))
@@ -327,6 +327,11 @@ class WebBrowseToolConfig(Base):
     enabled: bool = False
     max_chars: int = 50000
     screenshot_dir: str = "screenshots"
+    pool_size: int = 1  # Pre-launched browser pages; >1 allows parallel navigations
+    block_images: bool = True  # Abort image requests during navigation
+    block_fonts: bool = True  # Abort font requests during navigation
+    block_media: bool = True  # Abort audio/video requests during navigation
+    persist_profile: bool = True  # Keep browser profile on disk for warm restarts
 
 
 class WebToolsConfig(Base):
@@ -1,5 +1,6 @@
 """Tests for the WebBrowseTool (headless browser)."""
 
+import asyncio
 import json
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -38,7 +39,7 @@ def _mock_page(
     page.title = AsyncMock(return_value=title)
     page.url = url
     page.content = AsyncMock(return_value=html)
-    page.screenshot = AsyncMock()
+    page.screenshot = AsyncMock(return_value=b"\x89fake-image-bytes")
     page.evaluate = AsyncMock(return_value=42)
     return page
 
@@ -86,6 +87,94 @@ class TestNavigate:
         assert result["finalUrl"] == "https://example.com/final"
         assert result["title"] == "Test Page"
 
+    async def test_navigate_retries_commit_on_timeout(self, tmp_path):
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        page = _mock_page()
+        page.goto = AsyncMock(side_effect=[TimeoutError("slow"), mock_response])
+        tool = _make_tool(tmp_path, page=page)
+
+        with patch.object(tool, "_ensure_browser", new_callable=AsyncMock):
+            result = json.loads(await tool.execute(action="navigate", url="https://example.com"))
+
+        assert result["ok"] is True
+        assert page.goto.await_count == 2
+        assert page.goto.await_args.kwargs["wait_until"] == "commit"
+
+    async def test_navigate_wait_for_selector(self, tmp_path):
+        page = _mock_page()
+        tool = _make_tool(tmp_path, page=page)
+
+        with patch.object(tool, "_ensure_browser", new_callable=AsyncMock):
+            await tool.execute(action="navigate", url="https://example.com", waitFor="#app")
+
+        page.wait_for_selector.assert_awaited_once_with("#app", timeout=10000)
+
+    async def test_navigate_coalesces_concurrent_same_url(self, tmp_path):
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        page = _mock_page()
+
+        async def slow_goto(*_args, **_kwargs):
+            await asyncio.sleep(0.05)
+            return mock_response
+
+        page.goto = AsyncMock(side_effect=slow_goto)
+        tool = _make_tool(tmp_path, page=page)
+
+        with patch.object(tool, "_ensure_browser", new_callable=AsyncMock):
+            r1, r2 = await asyncio.gather(
+                tool.execute(action="navigate", url="https://example.com"),
+                tool.execute(action="navigate", url="https://example.com"),
+            )
+
+        assert page.goto.await_count == 1
+        assert json.loads(r1) == json.loads(r2)
+
+    async def test_navigate_waiter_wakes_when_leader_cancelled(self, tmp_path):
+        page = _mock_page()
+
+        async def hanging_goto(*_args, **_kwargs):
+            await asyncio.sleep(10)
+
+        page.goto = AsyncMock(side_effect=hanging_goto)
+        tool = _make_tool(tmp_path, page=page)
+
+        with patch.object(tool, "_ensure_browser", new_callable=AsyncMock):
+            leader = asyncio.create_task(tool.execute(action="navigate", url="https://example.com"))
+            await asyncio.sleep(0.05)
+            waiter = asyncio.create_task(tool.execute(action="navigate", url="https://example.com"))
+            await asyncio.sleep(0.05)
+            leader.cancel()
+            result = json.loads(await asyncio.wait_for(waiter, timeout=1))
+
+        assert "cancelled" in result["error"]
+        assert tool._inflight == {}
+
+    async def test_navigate_repeat_served_from_ttl_cache(self, tmp_path):
+        page = _mock_page()
+        tool = _make_tool(tmp_path, page=page)
+
+        with patch.object(tool, "_ensure_browser", new_callable=AsyncMock):
+            await tool.execute(action="navigate", url="https://example.com")
+            result = json.loads(await tool.execute(action="navigate", url="https://example.com"))
+
+        assert page.goto.await_count == 1
+        assert result["ok"] is True
+
+    async def test_navigate_result_cache_is_bounded(self, tmp_path, monkeypatch):
+        from nanobot.agent.tools import browse as browse_mod
+
+        monkeypatch.setattr(browse_mod, "_NAV_CACHE_SIZE", 2)
+        page = _mock_page()
+        tool = _make_tool(tmp_path, page=page)
+
+        with patch.object(tool, "_ensure_browser", new_callable=AsyncMock):
+            for i in range(5):
+                await tool.execute(action="navigate", url=f"https://example.com/{i}")
+
+        assert len(tool._nav_cache) <= 2
+
     async def test_navigate_missing_url(self, tmp_path):
         tool = _make_tool(tmp_path)
         result = json.loads(await tool.execute(action="navigate"))
@@ -119,6 +208,93 @@ class TestGetContent:
         assert "truncated" in result
         assert "length" in result
 
+    async def test_get_content_in_page_fast_path(self, tmp_path):
+        page = _mock_page()
+        page.evaluate = AsyncMock(
+            return_value={"title": "T", "text": "Fast text", "html": "<p>Fast text</p>"}
+        )
+        tool = _make_tool(tmp_path, page=page)
+
+        result = json.loads(await tool.execute(action="get_content"))
+
+        assert result["extractor"] == "in-page"
+        assert "Fast text" in result["text"]
+        page.content.assert_not_awaited()
+
+    async def test_readability_parse_shared_across_modes(self, tmp_path):
+        page = _mock_page(html="<html><body><p>Hello world</p></body></html>")
+        tool = _make_tool(tmp_path, page=page)
+
+        mock_doc = MagicMock()
+        mock_doc.summary.return_value = "<p>Hello world</p>"
+        mock_doc.title.return_value = "T"
+
+        with patch("readability.Document", return_value=mock_doc) as doc_cls:
+            await tool.execute(action="get_content", extractMode="text")
+            await tool.execute(action="get_content", extractMode="markdown")
+
+        doc_cls.assert_called_once()
+        mock_doc.summary.assert_called_once()
+
+    def test_to_markdown_drops_html_comments(self):
+        md = WebBrowseTool._to_markdown("<p>hi</p><!-- <div>old menu</div> junk --><p>bye</p>")
+        assert "old menu" not in md
+        assert "hi" in md
+        assert "bye" in md
+
+    async def test_get_content_raw_text(self, tmp_path):
+        page = _mock_page()
+        page.evaluate = AsyncMock(return_value="plain body text")
+        tool = _make_tool(tmp_path, page=page)
+
+        result = json.loads(await tool.execute(action="get_content", extractMode="raw_text"))
+
+        assert result["extractor"] == "raw"
+        assert result["text"] == "plain body text"
+        page.content.assert_not_awaited()
+
+    async def test_get_content_raw_html_bounded(self, tmp_path):
+        page = _mock_page()
+        # The in-browser slice returns at most max_chars + 1 characters; the
+        # extra char is how truncation gets detected.
+        page.evaluate = AsyncMock(return_value="A" * 51)
+        tool = _make_tool(tmp_path, page=page, max_chars=50)
+
+        result = json.loads(await tool.execute(action="get_content", extractMode="raw_html"))
+
+        assert "slice(0, 51)" in page.evaluate.await_args.args[0]
+        assert result["extractor"] == "raw"
+        assert result["truncated"] is True
+        assert result["length"] == 50
+
+    async def test_get_content_raw_html_short_page_not_truncated(self, tmp_path):
+        page = _mock_page()
+        page.evaluate = AsyncMock(return_value="<html>ok</html>")
+        tool = _make_tool(tmp_path, page=page, max_chars=50)
+
+        result = json.loads(await tool.execute(action="get_content", extractMode="raw_html"))
+
+        assert result["truncated"] is False
+        assert result["text"] == "<html>ok</html>"
+
+    async def test_get_content_reports_clipped_html_fetch(self, tmp_path):
+        page = _mock_page()
+        # First evaluate is the in-page extractor (no landmark), second is the
+        # outerHTML slice coming back at its limit + 1, i.e. fetch-clipped.
+        page.evaluate = AsyncMock(side_effect=[None, "A" * 401])
+        tool = _make_tool(tmp_path, page=page, max_chars=50)
+
+        mock_doc = MagicMock()
+        mock_doc.summary.return_value = "<p>short</p>"
+        mock_doc.title.return_value = "T"
+
+        with patch("readability.Document", return_value=mock_doc):
+            result = json.loads(await tool.execute(action="get_content"))
+
+        assert "slice(0, 401)" in page.evaluate.await_args.args[0]
+        assert result["truncated"] is True
+        assert result["length"] < 50
+
     async def test_get_content_truncation(self, tmp_path):
         page = _mock_page(html="<html><body><p>" + "A" * 200 + "</p></body></html>")
         tool = _make_tool(tmp_path, page=page, max_chars=50)
@@ -145,6 +321,27 @@ class TestScreenshot:
         assert "path" in result
         assert str(tmp_path / "screenshots") in result["path"]
         page.screenshot.assert_awaited_once()
+        assert Path(result["path"]).read_bytes() == b"\x89fake-image-bytes"
+
+    async def test_screenshot_default_jpeg(self, tmp_path):
+        page = _mock_page()
+        tool = _make_tool(tmp_path, page=page)
+
+        result = json.loads(await tool.execute(action="screenshot"))
+
+        assert result["path"].endswith(".jpg")
+        kwargs = page.screenshot.await_args.kwargs
+        assert kwargs["type"] == "jpeg"
+        assert kwargs["quality"] == 80
+
+    async def test_screenshot_png_filename_wins(self, tmp_path):
+        page = _mock_page()
+        tool = _make_tool(tmp_path, page=page)
+
+        result = json.loads(await tool.execute(action="screenshot", filename="shot.png"))
+
+        assert result["path"].endswith("shot.png")
+        assert page.screenshot.await_args.kwargs["type"] == "png"
 
     async def test_screenshot_no_page(self, tmp_path):
         tool = _make_tool(tmp_path)
@@ -161,7 +358,19 @@ class TestExecuteJs:
 
         assert result["ok"] is True
         assert result["result"] == 42
-        page.evaluate.assert_awaited_once_with("1 + 1")
+        page.evaluate.assert_awaited_once()
+        assert "1 + 1" in page.evaluate.await_args.args[0]
+
+    async def test_execute_js_truncates_huge_result(self, tmp_path):
+        page = _mock_page()
+        page.evaluate = AsyncMock(return_value={"__truncated": True, "preview": "x" * 10})
+        tool = _make_tool(tmp_path, page=page)
+
+        result = json.loads(await tool.execute(action="execute_js", script="bigThing"))
+
+        assert result["ok"] is True
+        assert result["truncated"] is True
+        assert result["result"] == "x" * 10
 
     async def test_execute_js_no_script(self, tmp_path):
         page = _mock_page()
@@ -170,6 +379,69 @@ class TestExecuteJs:
         assert "script is required" in result["error"]
 
 
+class TestPagePool:
+    async def test_acquire_waits_for_cold_pool(self, tmp_path):
+        tool = WebBrowseTool(workspace=tmp_path)  # no page, empty pool
+        page = _mock_page()
+
+        task = asyncio.create_task(tool._acquire_page())
+        await asyncio.sleep(0.1)
+        assert not task.done()
+
+        tool._page_pool.put_nowait(page)
+        assert await asyncio.wait_for(task, timeout=1) is page
+
+    async def test_current_page_recycled_at_use_cap(self, tmp_path):
+        page = _mock_page()
+        fresh = _mock_page()
+        tool = _make_tool(tmp_path, page=page)
+        tool._page_uses[id(page)] = 50
+
+        with (
+            patch.object(tool, "_ensure_browser", new_callable=AsyncMock),
+            patch.object(tool, "_new_page", AsyncMock(return_value=fresh)),
+        ):
+            result = json.loads(await tool.execute(action="navigate", url="https://example.com"))
+
+        assert result["ok"] is True
+        page.close.assert_awaited_once()
+        fresh.goto.assert_awaited_once()
+        assert tool._page is fresh
+
+    async def test_release_drops_slot_when_replacement_fails(self, tmp_path):
+        page = _mock_page()
+        tool = _make_tool(tmp_path, page=page)
+        tool._browser = MagicMock()
+        tool._page_uses[id(page)] = 50
+
+        with patch.object(tool, "_new_page", side_effect=Exception("boom")):
+            await tool._release_page(page)
+
+        page.close.assert_awaited_once()
+        assert tool._page_pool.empty()  # the closed page must not be re-pooled
+
+
+class TestProfilePrune:
+    def test_prune_removes_oversized_profile(self, tmp_path, monkeypatch):
+        from nanobot.agent.tools import browse as browse_mod
+
+        profile = tmp_path / ".camoufox_profile"
+        profile.mkdir()
+        (profile / "cache.bin").write_bytes(b"x" * 1024)
+
+        monkeypatch.setattr(browse_mod, "_MAX_PROFILE_BYTES", 512)
+        WebBrowseTool._prune_profile(profile)
+        assert not profile.exists()
+
+    def test_prune_keeps_small_profile(self, tmp_path):
+        profile = tmp_path / ".camoufox_profile"
+        profile.mkdir()
+        (profile / "cache.bin").write_bytes(b"x" * 16)
+
+        WebBrowseTool._prune_profile(profile)
+        assert profile.exists()
+
+
 class TestCloseAndMisc:
     async def test_close_action(self, tmp_path):
         page = _mock_page()
@@ -214,6 +486,13 @@ class TestConfigSchema:
         assert cfg.max_chars == 1000
         assert cfg.screenshot_dir == "snaps"
 
+    def test_browse_resource_blocking_flags(self):
+        tool = WebBrowseTool(workspace=Path("/tmp"))
+        assert tool._blocked_types == {"image", "font", "media"}
+
+        tool = WebBrowseTool(workspace=Path("/tmp"), block_images=False, block_media=False)
+        assert tool._blocked_types == {"font"}
+
     def test_web_tools_config_has_browse(self):
         cfg = WebToolsConfig()
         assert hasattr(cfg, "browse")